@@ -1,61 +1,70 @@
 import io
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Tuple
 
 import pandas as pd
 import streamlit as st
 from PIL import Image, ImageDraw, ImageFont
 
-from nlp.parse import read_resume, normalize_text, detect_sections, extract_skills, extract_contact
+from nlp.parse import read_resume, normalize_text, detect_sections, extract_skills, extract_contact, get_catalog
 from nlp.score import (
-    embedder, cosine_embed_sim, weighted_skill_overlap, level_match,
-    top_missing_keywords, missing_from, overall_score
+    MODEL_NAME, embed_backend, catalog_embeddings, cosine_embed_sim,
+    weighted_skill_overlap, level_match, top_missing_keywords, missing_from, overall_score
 )
 from nlp.rewrite import tailored_rewrites
 
 APP_NAME = "AI Resume Tailor"
 
-st.set_page_config(page_title=f"{APP_NAME}", page_icon="🧵", layout="wide")
-st.title("🧵 AI Resume Tailor")
-st.caption("Upload your resume and paste a job description to get a match score, gaps, and recruiter-ready bullet rewrites. Files are processed in-memory and not stored.")
 
-# Sidebar – settings
-with st.sidebar:
-    st.header("Settings")
-    st.write("Model: sentence-transformers/all-MiniLM-L6-v2")
-    st.write("Weights: skills 50%, similarity 25%, keywords 15%, level 10%")
-    show_debug = st.checkbox("Show debug details", value=False)
+@st.cache_resource(show_spinner=False)
+def worker_pool() -> ThreadPoolExecutor:
+    """Server-wide pool for model work; loading starts here so the first click doesn't pay for it."""
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jobfit")
+    pool.submit(catalog_embeddings)  # loads the model, then embeds the skills catalog once
+    return pool
 
-# Inputs
-col1, col2 = st.columns(2)
-with col1:
-    resume_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"], help="We parse text only. Avoid image-only PDFs for best results.")
-with col2:
-    jd_text = st.text_area("Paste the job description", height=260, placeholder="Paste full job description here …")
 
-analyze = st.button("Tailor my resume ✨", use_container_width=True, type="primary")
+@dataclass(frozen=True)
+class AnalysisResult:
+    score: float
+    s_skills: float
+    s_embed: float
+    s_kw: float
+    s_level: float
+    resume_skills: List[str]
+    jd_skills: List[str]
+    missing_kw: List[str]
+    sections: Dict[str, str]
+    contact: Dict[str, str]
+    bullets: List[str]
+    rewrites: List[Tuple[str, str]]
+    ats_checks: List[Dict]
+    elapsed: float
 
-if analyze:
-    if not (resume_file and jd_text.strip()):
-        st.warning("Please upload a resume and paste a job description.")
-        st.stop()
 
-    # Read & normalize
+@st.cache_data(show_spinner=False, max_entries=16)
+def analyze(resume_bytes: bytes, filename: str, jd_text: str) -> AnalysisResult:
+    """Full resume/JD pipeline. Pure in its inputs, so Streamlit reruns with the same file and JD are free."""
     t0 = time.time()
-    resume_bytes = io.BytesIO(resume_file.read())
+
+    # Read & normalize
     try:
-        resume_raw = read_resume(resume_bytes, resume_file.name)
+        resume_raw = read_resume(io.BytesIO(resume_bytes), filename)
     except Exception as e:
-        st.error(f"Could not read resume: {e}")
-        st.stop()
+        raise ValueError(f"Could not read resume: {e}") from e
 
     resume_text = normalize_text(resume_raw)
     jd_text_norm = normalize_text(jd_text)
 
-    # Load skills catalog
-    skills_df = pd.read_csv("nlp/skills_catalog.csv")
-    catalog = skills_df["skill"].astype(str).str.lower().tolist()
+    # Embedding runs on the worker pool while the CPU-side extraction and scoring below proceed
+    embed_future = worker_pool().submit(cosine_embed_sim, resume_text, jd_text_norm)
+
+    # Skills catalog (parsed once at import)
+    catalog = get_catalog()
 
     # Basic extractions
     sections = detect_sections(resume_text)
@@ -65,15 +74,16 @@ if analyze:
 
     # Scoring components
     s_skills = weighted_skill_overlap(resume_skills, jd_text_norm, catalog)
-    s_embed = cosine_embed_sim(resume_text, jd_text_norm)
     missing_kw = top_missing_keywords(resume_text, jd_text_norm)
+    s_embed = embed_future.result()
     s_kw = 1.0 - min(len(missing_kw), 10) / 10.0
     s_level = level_match(resume_text, jd_text_norm)
     score = overall_score(s_skills, s_embed, s_kw, s_level)
 
     # Tailored rewrites
     bullets_src = sections.get("experience", "") or sections.get("work experience", "")
-    bullets = [b.strip("-• \t").strip() for b in bullets_src.split("\n") if len(b.strip()) > 0][:8]
+    # stop after 8 bullets instead of stripping every line of a long section
+    bullets = list(islice((s for s in (b.strip("-• \t") for b in bullets_src.splitlines()) if s), 8))
     rewrites = tailored_rewrites(bullets, jd_text_norm, prefer_keywords=missing_kw)
 
     # ATS checks
@@ -85,7 +95,104 @@ if analyze:
         {"name": "Resume length reasonable", "pass": 200 <= len(resume_text) <= 20000},
     ]
 
-    t1 = time.time()
+    return AnalysisResult(
+        score=score, s_skills=s_skills, s_embed=s_embed, s_kw=s_kw, s_level=s_level,
+        resume_skills=resume_skills, jd_skills=jd_skills, missing_kw=missing_kw,
+        sections=sections, contact=contact, bullets=bullets, rewrites=rewrites, ats_checks=ats_checks,
+        elapsed=time.time() - t0,
+    )
+
+
+BADGE_W, BADGE_H = 900, 300
+SCORE_BOX_W, SCORE_BOX_H = 260, 180
+SCORE_X, SCORE_Y = BADGE_W - SCORE_BOX_W - 40, 60
+
+
+@st.cache_resource
+def badge_font(name: str, size: int) -> ImageFont.ImageFont:
+    # Basic fonts (fallback to default if no system fonts available)
+    try:
+        return ImageFont.truetype(name, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+@st.cache_resource
+def badge_template() -> Image.Image:
+    """Static badge background: title, score box and "/ 100" label, drawn once per server."""
+    img = Image.new("RGB", (BADGE_W, BADGE_H), (249, 250, 251))  # near-white
+    d = ImageDraw.Draw(img)
+    d.text((40, 30), "AI Resume Tailor", font=badge_font("DejaVuSans-Bold.ttf", 56), fill=(31, 41, 55))
+
+    # Score circle-like block
+    d.rounded_rectangle([(SCORE_X, SCORE_Y), (SCORE_X + SCORE_BOX_W, SCORE_Y + SCORE_BOX_H)], radius=24, fill=(229, 231, 235))
+    d.text((SCORE_X + 40, SCORE_Y + 130), "/ 100", font=badge_font("DejaVuSans.ttf", 28), fill=(75, 85, 99))
+    return img
+
+
+def generate_badge(score: float, role: str, company: str) -> Image.Image:
+    """Create a simple shareable PNG badge with score, role and company."""
+    img = badge_template().copy()
+    d = ImageDraw.Draw(img)
+    body_font = badge_font("DejaVuSans.ttf", 28)
+
+    d.text((40, 110), f"{role} @ {company}", font=body_font, fill=(55, 65, 81))
+    d.text((SCORE_X + 30, SCORE_Y + 40), f"{score:.1f}", font=badge_font("DejaVuSans-Bold.ttf", 100), fill=(17, 24, 39))
+    d.text((40, 200), f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", font=body_font, fill=(107, 114, 128))
+    return img
+
+
+st.set_page_config(page_title=f"{APP_NAME}", page_icon="🧵", layout="wide")
+st.title("🧵 AI Resume Tailor")
+worker_pool()  # warm the embedding model while the user fills in the inputs
+st.caption("Upload your resume and paste a job description to get a match score, gaps, and recruiter-ready bullet rewrites. Files are processed in-memory and not stored.")
+
+# Sidebar – settings
+with st.sidebar:
+    st.header("Settings")
+    st.write(f"Model: {MODEL_NAME} ({'int8 ONNX' if embed_backend() == 'onnx' else 'FP32 torch'})")
+    st.write("Weights: skills 50%, similarity 25%, keywords 15%, level 10%")
+    show_debug = st.checkbox("Show debug details", value=False)
+
+# Inputs
+col1, col2 = st.columns(2)
+with col1:
+    resume_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"], help="We parse text only. Avoid image-only PDFs for best results.")
+with col2:
+    jd_text = st.text_area("Paste the job description", height=260, placeholder="Paste full job description here …")
+
+analyze_clicked = st.button("Tailor my resume ✨", use_container_width=True, type="primary")
+
+resume_bytes = resume_file.getvalue() if resume_file else b""
+input_key = (hash(resume_bytes), resume_file.name if resume_file else "", hash(jd_text))
+if analyze_clicked:
+    if not (resume_file and jd_text.strip()):
+        st.warning("Please upload a resume and paste a job description.")
+        st.stop()
+    # Results stay on screen across reruns (tab widgets, badge button) only while the inputs match this click
+    st.session_state["analyzed_key"] = input_key
+
+analyzed_key = st.session_state.get("analyzed_key")
+if analyzed_key is not None and analyzed_key != input_key:
+    st.info("Your resume or job description changed. Click “Tailor my resume” to update the results.")
+
+elif analyzed_key is not None:
+    # Same inputs as the last run in this session: skip even the st.cache_data lookup
+    if st.session_state.get("last_key") == input_key:
+        result = st.session_state["last_result"]
+    else:
+        try:
+            result = analyze(resume_bytes, resume_file.name, jd_text)
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+        st.session_state["last_key"], st.session_state["last_result"] = input_key, result
+
+    score = result.score
+    s_skills, s_embed, s_kw, s_level = result.s_skills, result.s_embed, result.s_kw, result.s_level
+    resume_skills, jd_skills, missing_kw = result.resume_skills, result.jd_skills, result.missing_kw
+    sections, contact = result.sections, result.contact
+    bullets, rewrites, ats_checks = result.bullets, result.rewrites, result.ats_checks
 
     # Layout: Score + Breakdown
     st.subheader("Match Score")
@@ -100,7 +207,7 @@ if analyze:
             "keyword_coverage (15%)": round(s_kw, 2),
             "level_match (10%)": round(s_level, 2)
         })
-        st.caption(f"Processed in {t1 - t0:.2f}s on this machine.")
+        st.caption(f"Processed in {result.elapsed:.2f}s on this machine.")
 
     # Tabs for details
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -150,34 +257,3 @@ if analyze:
             st.image(img, caption="Right-click → Save image")
 
     st.success("Analysis complete. You can tweak your resume using the suggestions above.")
-
-
-def generate_badge(score: float, role: str, company: str) -> Image.Image:
-    """Create a simple shareable PNG badge with score, role and company."""
-    w, h = 900, 300
-    img = Image.new("RGB", (w, h), (249, 250, 251))  # near-white
-    d = ImageDraw.Draw(img)
-
-    # Basic fonts (fallback to default if no system fonts available)
-    try:
-        title_font = ImageFont.truetype("DejaVuSans-Bold.ttf", 56)
-        body_font = ImageFont.truetype("DejaVuSans.ttf", 28)
-        big_font = ImageFont.truetype("DejaVuSans-Bold.ttf", 100)
-    except Exception:
-        title_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        big_font = ImageFont.load_default()
-
-    # Text blocks
-    d.text((40, 30), "AI Resume Tailor", font=title_font, fill=(31, 41, 55))
-    d.text((40, 110), f"{role} @ {company}", font=body_font, fill=(55, 65, 81))
-
-    # Score circle-like block
-    score_box_w, score_box_h = 260, 180
-    score_x, score_y = w - score_box_w - 40, 60
-    d.rounded_rectangle([(score_x, score_y), (score_x + score_box_w, score_y + score_box_h)], radius=24, fill=(229, 231, 235))
-    d.text((score_x + 30, score_y + 40), f"{score:.1f}", font=big_font, fill=(17, 24, 39))
-    d.text((score_x + 40, score_y + 130), "/ 100", font=body_font, fill=(75, 85, 99))
-
-    d.text((40, 200), f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", font=body_font, fill=(107, 114, 128))
-    return img
\ No newline at end of file
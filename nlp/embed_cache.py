@@ -0,0 +1,55 @@
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class EmbedCache:
+    """On-disk store of normalized text embeddings, keyed by sha256 of the text.
+
+    Vectors are kept as float16 blobs (384 dims -> 768 bytes). They are
+    normalized before storing, so cosine similarity stays a plain dot product.
+    """
+
+    def __init__(self, path: str, namespace: str = ""):
+        # namespace (e.g. the model name) keeps vectors from different models apart
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (sha256 TEXT PRIMARY KEY, dim INT, vec BLOB)"
+            )
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dim, vec FROM embeddings WHERE sha256 = ?", (self.key(text),)
+            ).fetchone()
+        if row is None:
+            return None
+        dim, blob = row
+        vec = np.frombuffer(blob, dtype=np.float16)
+        if vec.size != dim:
+            return None
+        return vec.astype(np.float32)
+
+    def put(self, text: str, vec: np.ndarray) -> None:
+        vec = np.asarray(vec, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (sha256, dim, vec) VALUES (?, ?, ?)",
+                (self.key(text), vec.size, vec.astype(np.float16).tobytes()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,42 +1,122 @@
+import csv
 import re
+import zipfile
+import xml.etree.ElementTree as ET
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Iterator, Set, Tuple
 
-from pdfminer.high_level import extract_text as pdf_text
-from docx import Document
-from rapidfuzz import fuzz
+import ahocorasick
+import pypdfium2 as pdfium
+from pdfminer.high_level import extract_text as pdfminer_text
 
 COMMON_SECTIONS = [
     "experience", "work experience", "projects", "education", "skills",
     "summary", "objective", "certifications", "publications"
 ]
 
+# Longest names first so "work experience" wins over the "experience" inside it
+SECTION_RE = re.compile(r"\b(" + "|".join(map(re.escape, sorted(COMMON_SECTIONS, key=len, reverse=True))) + r")\b")
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+SKIPPED_TAGS = (MC_FALLBACK, W_NS + "pPr")
+
+CATALOG_PATH = Path(__file__).with_name("skills_catalog.csv")
+
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"(\+?\d[\d\-\s]{7,}\d)")
 
 
+def _load_catalog(path: Path) -> Tuple[Tuple[str, ...], Dict[str, Tuple[str, ...]]]:
+    skills, aliases = set(), {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            skill = row["skill"].strip().lower()
+            if not skill:
+                continue
+            skills.add(skill)
+            extra = tuple(a.strip().lower() for a in (row.get("aliases") or "").split("|") if a.strip())
+            if extra:
+                aliases[skill] = extra
+    return tuple(sorted(skills)), aliases
+
+
+# Parsed once at import; every analysis shares the same tuple
+_CATALOG, _ALIASES = _load_catalog(CATALOG_PATH)
+
+
+def get_catalog() -> Tuple[str, ...]:
+    return _CATALOG
+
+
+def pdf_text(file_bytes: BytesIO) -> str:
+    try:
+        pdf = pdfium.PdfDocument(file_bytes)
+    except pdfium.PdfiumError:
+        # e.g. encrypted files PDFium won't open; pdfminer is slower but more forgiving
+        file_bytes.seek(0)
+        return pdfminer_text(file_bytes)
+    try:
+        return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+    finally:
+        pdf.close()
+
+
+def docx_text(file_bytes: BytesIO) -> str:
+    # Stream word/document.xml instead of building python-docx's object model
+    paragraphs = []
+    stack = []  # run buffers of open w:p; text boxes nest paragraphs inside paragraphs
+    # Subtrees with no paragraph text: mc:Fallback is Word's second copy of text boxes already read
+    # from mc:Choice, and w:pPr holds tab-stop definitions (w:tabs/w:tab) that must not become "\t"
+    skip = 0
+    with zipfile.ZipFile(file_bytes) as z, z.open("word/document.xml") as f:
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            if el.tag in SKIPPED_TAGS:
+                skip += 1 if event == "start" else -1
+                if event == "end":
+                    el.clear()
+                continue
+            if skip:
+                continue
+            if event == "start":
+                if el.tag == W_NS + "p":
+                    stack.append([])
+                continue
+            if el.tag == W_NS + "p":
+                paragraphs.append("".join(stack.pop()))
+                el.clear()
+            elif not stack:
+                continue
+            elif el.tag == W_NS + "t":
+                if el.text:
+                    stack[-1].append(el.text)
+            elif el.tag == W_NS + "tab":
+                stack[-1].append("\t")
+            elif el.tag in (W_NS + "br", W_NS + "cr"):
+                stack[-1].append("\n")
+    return "\n".join(paragraphs)
+
+
 def read_resume(file_bytes: BytesIO, filename: str) -> str:
     name = filename.lower()
     if name.endswith(".pdf"):
         return pdf_text(file_bytes)
     if name.endswith(".docx"):
-        doc = Document(file_bytes)
-        return "\n".join(p.text for p in doc.paragraphs)
+        return docx_text(file_bytes)
     raise ValueError("Unsupported file type. Please upload PDF or DOCX.")
 
 
 def normalize_text(t: str) -> str:
-    t = re.sub(r"\s+", " ", t)
-    return t.strip()
+    # str.split() with no separator collapses whitespace runs and trims both ends in C
+    return " ".join(t.split())
 
 
 def detect_sections(text: str) -> Dict[str, str]:
     chunks = {}
-    lower = text.lower()
-    for sec in COMMON_SECTIONS:
-        idx = lower.find(sec)
-        if idx != -1:
-            chunks[sec] = idx
+    for m in SECTION_RE.finditer(text.lower()):
+        chunks.setdefault(m.group(1), m.start())
     ordered = sorted(chunks.items(), key=lambda kv: kv[1])
     ranges = []
     for i, (sec, start) in enumerate(ordered):
@@ -45,25 +125,61 @@ def detect_sections(text: str) -> Dict[str, str]:
     return dict(ranges)
 
 
+def _variants(skill: str) -> Set[str]:
+    """Spellings that count as the skill: catalog aliases (incl. real plurals) plus the .js/js rule."""
+    out = {skill, *_ALIASES.get(skill, ())}
+    for v in list(out):
+        if v.endswith(".js"):
+            out.add(v[:-3])
+        elif v.endswith("js") and len(v) > 4:
+            out.add(v[:-2])
+    return out
+
+
+@lru_cache(maxsize=8)
+def _skill_automaton(skills: Tuple[str, ...]) -> ahocorasick.Automaton:
+    # Built once per catalog; every variant maps back to its canonical skill
+    words = {s: s for s in skills}
+    for s in skills:
+        for v in _variants(s):
+            words.setdefault(v, s)
+    A = ahocorasick.Automaton()
+    for word, skill in words.items():
+        A.add_word(word, (len(word), skill))
+    A.make_automaton()
+    return A
+
+
+def _is_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not before.isalnum() and not after.isalnum()
+
+
+def _skill_tuple(skill_list) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(s for s in (sk.lower().strip() for sk in skill_list) if s))
+
+
+def skill_hits(lower: str, skill_list) -> Iterator[Tuple[int, str]]:
+    """Yield (start, skill) for each whole-word catalog hit in already-lowercased text."""
+    skills = _skill_tuple(skill_list)
+    if not skills:
+        return
+    for end, (n, s) in _skill_automaton(skills).iter(lower):
+        start = end - n + 1
+        if _is_boundary(lower, start, end + 1):
+            yield start, s
+
+
 def extract_skills(text: str, skill_list):
-    found = set()
-    lower = text.lower()
-    # exact match first
-    for sk in skill_list:
-        sk_low = sk.lower().strip()
-        if not sk_low:
-            continue
-        if re.search(rf"\b{re.escape(sk_low)}\b", lower):
-            found.add(sk_low)
-        else:
-            # fuzzy partial; keep threshold conservative to avoid false positives
-            if fuzz.partial_ratio(sk_low, lower) >= 90:
-                found.add(sk_low)
-    return sorted(found)
+    # one Aho-Corasick pass over aliases and variants; whole-word hits only, no fuzzy matching
+    return sorted({s for _, s in skill_hits(text.lower(), skill_list)})
 
 
 def extract_contact(text: str):
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
     return {
-        "email": EMAIL_RE.search(text).group(0) if EMAIL_RE.search(text) else "",
-        "phone": PHONE_RE.search(text).group(0) if PHONE_RE.search(text) else "",
+        "email": email.group(0) if email else "",
+        "phone": phone.group(0) if phone else "",
     }
\ No newline at end of file
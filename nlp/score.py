@@ -1,63 +1,204 @@
+import hashlib
+import importlib
+import logging
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import Counter
 from functools import lru_cache
-from typing import List
+from itertools import accumulate
+from pathlib import Path
+from typing import List, Optional, Tuple
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
 
 from sentence_transformers import SentenceTransformer
 
+from .embed_cache import EmbedCache
+from .parse import get_catalog, skill_hits
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Dynamically quantized int8 export published alongside the model (VNNI kernels on modern x86)
+ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+# MiniLM truncates at 256 tokens; longer texts are embedded as overlapping windows
+CHUNK_TOKENS = 220
+CHUNK_STRIDE = 32
+CATALOG_EMB_DIR = Path(__file__).parent
+
+# Keeps tech tokens like "c++", "c#" and "node.js" whole, without trailing punctuation
+TOKEN_RE = re.compile(r"[a-z][a-z0-9+#.-]*[a-z0-9+#]")
+
+
+log = logging.getLogger(__name__)
+
+_EMBEDDER_LOCK = threading.Lock()
+
 
 @lru_cache(maxsize=1)
+def embed_backend() -> str:
+    """"onnx" when ONNX Runtime and Optimum are installed, else "torch"; known without loading the model."""
+    try:
+        for mod in ("onnxruntime", "optimum.onnxruntime"):
+            importlib.import_module(mod)
+    except ImportError as e:
+        log.warning("ONNX backend unavailable (%s); falling back to FP32 torch embeddings", e)
+        return "torch"
+    return "onnx"
+
+
+@lru_cache(maxsize=1)
+def _load_embedder():
+    # Cached model (downloaded on first run); int8 ONNX Runtime when available
+    if embed_backend() == "onnx":
+        return SentenceTransformer(
+            MODEL_NAME, backend="onnx",
+            model_kwargs={"file_name": ONNX_FILE, "provider": "CPUExecutionProvider"},
+        )
+    return SentenceTransformer(MODEL_NAME)
+
+
 def embedder():
-    # Cached model (downloaded on first run)
-    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+    # A warm-up thread and a request may ask at the same time; load the model only once
+    with _EMBEDDER_LOCK:
+        return _load_embedder()
+
+
+@lru_cache(maxsize=1)
+def embed_cache() -> Optional[EmbedCache]:
+    # Opt-in: embeddings only touch disk when JOBFIT_EMBED_CACHE names a SQLite file
+    path = os.environ.get("JOBFIT_EMBED_CACHE")
+    if not path:
+        return None
+    # int8 and FP32 vectors differ slightly, and chunking changes long-text vectors: both go in the key.
+    # The backend is known without loading the model, so cache hits never pay for it.
+    namespace = f"{MODEL_NAME}:{embed_backend()}:{CHUNK_TOKENS}/{CHUNK_STRIDE}"
+    return EmbedCache(path, namespace=namespace)
+
+
+def _chunks(model, text: str) -> List[str]:
+    # verbose=False: long texts are expected here, skip transformers' over-max-length warning
+    ids = model.tokenizer.encode(text, add_special_tokens=False, verbose=False)
+    if len(ids) <= CHUNK_TOKENS:
+        return [text]
+    step = CHUNK_TOKENS - CHUNK_STRIDE
+    return [model.tokenizer.decode(ids[i:i + CHUNK_TOKENS]) for i in range(0, len(ids) - CHUNK_STRIDE, step)]
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Normalized embeddings for texts, reusing the persistent cache when enabled."""
+    cache = embed_cache()
+    vecs = [cache.get(t) if cache else None for t in texts]
+    missing = [i for i, v in enumerate(vecs) if v is None]
+    if missing:
+        model = embedder()
+        chunks = [_chunks(model, texts[i]) for i in missing]
+        # every chunk of every miss in one batched forward pass
+        emb = model.encode(
+            [c for cs in chunks for c in cs], batch_size=32, convert_to_numpy=True, normalize_embeddings=True
+        )
+        bounds = np.cumsum([0] + [len(cs) for cs in chunks])
+        for i, lo, hi in zip(missing, bounds[:-1], bounds[1:]):
+            # mean-pool the document's chunks, then re-normalize
+            v = emb[lo:hi].mean(axis=0)
+            v /= np.linalg.norm(v)
+            vecs[i] = v
+            if cache:
+                cache.put(texts[i], v)
+    return np.stack(vecs)
 
 
 def cosine_embed_sim(resume_text: str, jd_text: str) -> float:
     # Use sentence embeddings for better semantic matching
-    model = embedder()
-    emb = model.encode([resume_text, jd_text], normalize_embeddings=True)
+    emb = embed_texts([resume_text, jd_text])
     # cosine similarity of two normalized vectors = dot product
-    return float((emb[0] * emb[1]).sum())
+    return float(emb[0] @ emb[1])
+
+
+@lru_cache(maxsize=1)
+def catalog_embeddings() -> np.ndarray:
+    """Normalized float16 embeddings of get_catalog(), one row per skill, memory-mapped from disk.
+
+    Semantic skill matching is then a single matmul: sentence_emb @ catalog_embeddings().T
+    """
+    catalog = get_catalog()
+    # the file name pins the model, backend and catalog contents it was built from
+    digest = hashlib.sha1("\n".join((MODEL_NAME, embed_backend(), *catalog)).encode("utf-8")).hexdigest()[:12]
+    path = CATALOG_EMB_DIR / f"catalog_embeddings.{digest}.npy"
+    if not path.exists():
+        emb = embedder().encode(list(catalog), batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        emb = emb.astype(np.float16)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, emb)
+            os.replace(tmp, path)
+        except OSError:
+            # read-only install: keep the array in memory for this process
+            tmp.unlink(missing_ok=True)
+            return emb
+    return np.load(path, mmap_mode="r")
 
 
 def keyword_ngrams(text: str, top_k=20):
-    vec = TfidfVectorizer(ngram_range=(1, 3), stop_words="english", min_df=1)
-    X = vec.fit_transform([text])
-    items = list(zip(vec.get_feature_names_out(), X.toarray()[0]))
-    return [k for k, _ in sorted(items, key=lambda kv: kv[1], reverse=True)[:top_k]]
+    # Single document, so tf-idf reduces to term frequency: count 1-3 grams directly
+    tokens = [t for t in TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOP_WORDS]
+    cnt = Counter(tokens)
+    cnt.update(" ".join(g) for g in zip(tokens, tokens[1:]))
+    cnt.update(" ".join(g) for g in zip(tokens, tokens[1:], tokens[2:]))
+    return [k for k, _ in cnt.most_common(top_k)]
 
 
 def weighted_skill_overlap(resume_skills: List[str], jd_text: str, skill_list: List[str]) -> float:
     jd_lower = jd_text.lower()
-    lines = [ln.strip() for ln in jd_lower.split("\n") if ln.strip()]
+    lines = jd_lower.split("\n")
+    # line start offsets, and each line's index among the non-empty lines
+    offsets = list(accumulate((len(ln) + 1 for ln in lines[:-1]), initial=0))
+    rank, n = [], 0
+    for ln in lines:
+        rank.append(n)
+        n += bool(ln.strip())
     weights = {}
 
-    for sk in skill_list:
-        s = sk.lower()
-        if s in jd_lower:
-            weight = 1.0
-            for i, ln in enumerate(lines):
-                if s in ln:
-                    if i < 5:
-                        weight = max(weight, 1.5)  # early emphasis
-                    if ln.endswith(":"):
-                        weight = max(weight, 1.3)
-                    break
-            weights[s] = weight
+    # single sweep over the JD; the first hit of a skill decides its weight
+    for start, s in skill_hits(jd_lower, skill_list):
+        if s in weights:
+            continue
+        i = bisect_right(offsets, start) - 1
+        weight = 1.0
+        if rank[i] < 5:
+            weight = max(weight, 1.5)  # early emphasis
+        if lines[i].strip().endswith(":"):
+            weight = max(weight, 1.3)
+        weights[s] = weight
 
     if not weights:
         return 0.0
 
+    resume_set = set(resume_skills)
     total = sum(weights.values())
-    matched = sum(w for s, w in weights.items() if s in set(resume_skills))
+    matched = sum(w for s, w in weights.items() if s in resume_set)
     return matched / total
 
 
+@lru_cache(maxsize=32)
+def _missing_keywords(resume_text: str, jd_text: str, k: int) -> Tuple[str, ...]:
+    # One fit over both documents: shared vocabulary, and IDF actually means something
+    vec = TfidfVectorizer(ngram_range=(1, 3), stop_words="english")
+    X = vec.fit_transform([resume_text, jd_text])
+    names = vec.get_feature_names_out()
+    # top 30 JD terms from the sparse row's non-zeros only, no dense vector;
+    # ties (common on JD text) break by feature order, as the dense stable argsort did
+    jd_row = X.getrow(1)
+    data, idx = jd_row.data, jd_row.indices
+    sel = np.lexsort((idx, -data))[:30]
+    in_resume = set(X.getrow(0).indices)
+    return tuple(names[i] for i in idx[sel] if i not in in_resume)[:k]
+
+
 def top_missing_keywords(resume_text: str, jd_text: str, k=10):
-    jd_keys = keyword_ngrams(jd_text, top_k=30)
-    res_keys = set(keyword_ngrams(resume_text, top_k=60))
-    return [kw for kw in jd_keys if kw not in res_keys][:k]
+    return list(_missing_keywords(resume_text, jd_text, k))
 
 
 def missing_from(jd_skills: List[str], resume_skills: List[str]) -> List[str]:
@@ -0,0 +1,76 @@
+import numpy as np
+
+from nlp import score
+from nlp.embed_cache import EmbedCache
+
+def test_roundtrip_normalized(tmp_path):
+    cache = EmbedCache(str(tmp_path / "emb.sqlite3"), namespace="m")
+    assert cache.get("resume") is None
+    cache.put("resume", np.array([3.0, 4.0]))
+    vec = cache.get("resume")
+    assert vec.dtype == np.float32
+    assert np.allclose(vec, [0.6, 0.8], atol=1e-3)
+
+def test_namespace_separates_models(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    EmbedCache(path, namespace="a").put("jd", np.ones(4))
+    assert EmbedCache(path, namespace="b").get("jd") is None
+    assert EmbedCache(path, namespace="a").get("jd") is not None
+
+def _no_model():
+    raise AssertionError("model should not be loaded")
+
+def test_embed_cache_does_not_load_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(score, "_load_embedder", _no_model)
+    score.embed_cache.cache_clear()
+    monkeypatch.delenv("JOBFIT_EMBED_CACHE", raising=False)
+    assert score.embed_cache() is None
+
+    score.embed_cache.cache_clear()
+    monkeypatch.setenv("JOBFIT_EMBED_CACHE", str(tmp_path / "emb.sqlite3"))
+    cache = score.embed_cache()
+    assert score.embed_backend() in cache.namespace
+    score.embed_cache.cache_clear()
+
+class FakeModel:
+    class tokenizer:
+        @staticmethod
+        def encode(text, add_special_tokens=False, verbose=True):
+            return text.split()
+
+    def __init__(self):
+        self.encoded = []
+
+    @staticmethod
+    def vector(text):
+        v = np.array([len(text), text.count("a") + 1, 1.0], dtype=np.float32)
+        return v / np.linalg.norm(v)
+
+    def encode(self, texts, **kwargs):
+        self.encoded.append(list(texts))
+        return np.stack([self.vector(t) for t in texts])
+
+def _cached_fake(tmp_path, monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(score, "_load_embedder", lambda: model)
+    monkeypatch.setenv("JOBFIT_EMBED_CACHE", str(tmp_path / "emb.sqlite3"))
+    score.embed_cache.cache_clear()
+    return model
+
+def test_repeat_similarity_served_from_cache(tmp_path, monkeypatch):
+    model = _cached_fake(tmp_path, monkeypatch)
+    first = score.cosine_embed_sim("python data engineer", "data engineer wanted")
+    assert model.encoded == [["python data engineer", "data engineer wanted"]]
+    second = score.cosine_embed_sim("python data engineer", "data engineer wanted")
+    assert len(model.encoded) == 1
+    assert abs(first - second) < 1e-3
+    score.embed_cache.cache_clear()
+
+def test_partial_hit_encodes_only_missing(tmp_path, monkeypatch):
+    model = _cached_fake(tmp_path, monkeypatch)
+    score.embed_texts(["cached resume"])
+    emb = score.embed_texts(["new job ad", "cached resume"])
+    assert model.encoded == [["cached resume"], ["new job ad"]]
+    assert np.allclose(emb[0], model.vector("new job ad"), atol=1e-3)
+    assert np.allclose(emb[1], model.vector("cached resume"), atol=1e-3)
+    score.embed_cache.cache_clear()
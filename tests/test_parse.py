@@ -1,4 +1,11 @@
-from nlp.parse import normalize_text, extract_skills
+import zipfile
+from io import BytesIO
+
+import pytest
+from pdfminer.pdfparser import PDFSyntaxError
+
+from nlp import parse
+from nlp.parse import read_resume, normalize_text, detect_sections, extract_skills, extract_contact, get_catalog
 
 def test_normalize():
     assert normalize_text(" a  b \n c ") == "a b c"
@@ -8,3 +15,89 @@ def test_extract_skills():
     text = "Worked with Python and Pandas on ETL pipelines."
     found = extract_skills(text, skills)
     assert "python" in found and "pandas" in found
+
+def test_extract_contact():
+    c = extract_contact("Jane Doe jane.doe@example.com +1 555-123-4567")
+    assert c == {"email": "jane.doe@example.com", "phone": "+1 555-123-4567"}
+    assert extract_contact("no contact here") == {"email": "", "phone": ""}
+
+def test_catalog_loaded_once():
+    catalog = get_catalog()
+    assert "python" in catalog and "skill" not in catalog
+    assert catalog is get_catalog()
+
+def test_detect_sections():
+    text = "Jane Doe Work Experience Built APIs Education BSc Skills Python"
+    sections = detect_sections(text)
+    assert list(sections) == ["work experience", "education", "skills"]
+    assert sections["work experience"] == "Work Experience Built APIs"
+
+def test_extract_skills_whole_words():
+    skills = ["java", "c++", "sql"]
+    text = "Built JavaScript apps in C++ and PostgreSQL."
+    assert extract_skills(text, skills) == ["c++"]
+
+def test_extract_skills_aliases():
+    text = "Deployed ReactJS on K8s backed by Postgres; designed REST APIs."
+    found = extract_skills(text, get_catalog())
+    assert found == ["kubernetes", "postgresql", "react", "rest api"]
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+def _docx(body: str) -> BytesIO:
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("word/document.xml", f'<w:document xmlns:w="{W}" xmlns:mc="{MC}"><w:body>{body}</w:body></w:document>')
+    buf.seek(0)
+    return buf
+
+def test_read_resume_docx():
+    body = ('<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:t xml:space="preserve"> Doe</w:t></w:r></w:p>'
+            '<w:p><w:r><w:t>Skills</w:t><w:tab/><w:t>Python</w:t></w:r></w:p>'
+            # tab-stop definitions in w:pPr are layout, not text
+            '<w:p><w:pPr><w:tabs><w:tab w:val="right" w:pos="9000"/></w:tabs></w:pPr>'
+            '<w:r><w:t>Acme Corp</w:t><w:tab/><w:t>2020-2023</w:t></w:r></w:p>')
+    assert read_resume(_docx(body), "cv.DOCX") == "Jane Doe\nSkills\tPython\nAcme Corp\t2020-2023"
+
+def test_read_resume_docx_text_box():
+    # Word writes a text box twice: a DrawingML copy under mc:Choice and a VML copy under mc:Fallback
+    box = '<w:txbxContent><w:p><w:r><w:t>Python Docker</w:t></w:r></w:p></w:txbxContent>'
+    body = ('<w:p><w:r><w:t>Header</w:t></w:r><w:r><mc:AlternateContent>'
+            f'<mc:Choice Requires="wps"><w:drawing>{box}</w:drawing></mc:Choice>'
+            f'<mc:Fallback><w:pict>{box}</w:pict></mc:Fallback>'
+            '</mc:AlternateContent></w:r><w:r><w:t xml:space="preserve"> tail</w:t></w:r></w:p>')
+    text = read_resume(_docx(body), "cv.docx")
+    assert text == "Python Docker\nHeader tail"
+    assert extract_skills(text, ["python", "docker"]) == ["docker", "python"]
+
+def test_extract_skills_listed_plurals_only():
+    found = extract_skills("Built a recommender system. Computer visions.", get_catalog())
+    assert found == ["recommendation systems"]
+
+PDF = b"""%PDF-1.4
+1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj
+2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj
+3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 300 144]/Contents 4 0 R/Resources<</Font<</F1 5 0 R>>>>>>endobj
+4 0 obj<</Length 44>>stream
+BT /F1 18 Tf 10 100 Td (Python Docker) Tj ET
+endstream endobj
+5 0 obj<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>endobj
+trailer<</Root 1 0 R>>
+%%EOF"""
+
+def test_read_resume_pdf():
+    assert read_resume(BytesIO(PDF), "cv.PDF") == "Python Docker"
+
+def test_read_resume_pdf_falls_back_to_pdfminer(monkeypatch):
+    positions = []
+    pdfminer_text = parse.pdfminer_text
+
+    def spy(file_bytes):
+        positions.append(file_bytes.tell())
+        return pdfminer_text(file_bytes)
+
+    monkeypatch.setattr(parse, "pdfminer_text", spy)
+    with pytest.raises(PDFSyntaxError):
+        read_resume(BytesIO(b"not a pdf at all"), "cv.pdf")
+    assert positions == [0]
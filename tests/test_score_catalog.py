@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+
+from nlp import score
+from nlp.parse import get_catalog
+
+class FakeModel:
+    backend = "torch"
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        return np.full((len(texts), 4), 0.5, dtype=np.float32)
+
+def _setup(tmp_path, monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(score, "_load_embedder", lambda: model)
+    monkeypatch.setattr(score, "CATALOG_EMB_DIR", tmp_path)
+    score.catalog_embeddings.cache_clear()
+    return model
+
+def test_catalog_embeddings_saved_and_memory_mapped(tmp_path, monkeypatch):
+    model = _setup(tmp_path, monkeypatch)
+    emb = score.catalog_embeddings()
+    assert isinstance(emb, np.memmap)
+    assert emb.shape == (len(get_catalog()), 4) and emb.dtype == np.float16
+    files = [p.name for p in tmp_path.iterdir()]
+    assert len(files) == 1 and files[0].startswith("catalog_embeddings.") and files[0].endswith(".npy")
+
+    # a fresh process only maps the saved file
+    score.catalog_embeddings.cache_clear()
+    assert isinstance(score.catalog_embeddings(), np.memmap)
+    assert model.calls == 1
+    score.catalog_embeddings.cache_clear()
+
+def test_catalog_embeddings_unwritable_dir(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+
+    def fail(*args):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(os, "replace", fail)
+    emb = score.catalog_embeddings()
+    assert not isinstance(emb, np.memmap) and emb.shape[0] == len(get_catalog())
+    assert list(tmp_path.iterdir()) == []
+    score.catalog_embeddings.cache_clear()
@@ -0,0 +1,62 @@
+import numpy as np
+
+from nlp import score
+
+class FakeTokenizer:
+    # "t0 t1 t2" <-> [0, 1, 2]
+    def encode(self, text, add_special_tokens=False, verbose=True):
+        return [int(w[1:]) for w in text.split()]
+
+    def decode(self, ids):
+        return " ".join(f"t{i}" for i in ids)
+
+class FakeModel:
+    backend = "torch"
+
+    def __init__(self):
+        self.tokenizer = FakeTokenizer()
+        self.encoded = []
+
+    @staticmethod
+    def vector(chunk):
+        ids = FakeTokenizer().encode(chunk)
+        v = np.array([ids[0] + 1, ids[-1] + 1, len(ids)], dtype=np.float32)
+        return v / np.linalg.norm(v)
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.stack([self.vector(t) for t in texts])
+
+def _tokens(start, n):
+    return " ".join(f"t{i}" for i in range(start, start + n))
+
+def _use_fake(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(score, "_load_embedder", lambda: model)
+    monkeypatch.delenv("JOBFIT_EMBED_CACHE", raising=False)
+    score.embed_cache.cache_clear()
+    return model
+
+def test_chunks_cover_every_token_with_overlap():
+    model = FakeModel()
+    assert score._chunks(model, _tokens(0, 220)) == [_tokens(0, 220)]
+    for n in (221, 409):
+        windows = [model.tokenizer.encode(c) for c in score._chunks(model, _tokens(0, n))]
+        assert windows[0][0] == 0 and windows[-1][-1] == n - 1
+        assert all(len(w) <= score.CHUNK_TOKENS for w in windows)
+        for prev, cur in zip(windows, windows[1:]):
+            assert cur[0] == prev[-1] + 1 - score.CHUNK_STRIDE
+            assert cur == list(range(cur[0], cur[-1] + 1))
+
+def test_documents_mean_pool_their_own_chunks(monkeypatch):
+    model = _use_fake(monkeypatch)
+    long_text, short_text = _tokens(0, 409), _tokens(1000, 5)
+    emb = score.embed_texts([long_text, short_text])
+    chunks = score._chunks(model, long_text)
+    assert model.encoded == chunks + [short_text]
+
+    expected = np.mean([model.vector(c) for c in chunks], axis=0)
+    assert np.allclose(emb[0], expected / np.linalg.norm(expected), atol=1e-6)
+    assert np.allclose(emb[1], model.vector(short_text), atol=1e-6)
+    assert np.allclose(np.linalg.norm(emb, axis=1), 1.0, atol=1e-6)
+    score.embed_cache.cache_clear()
@@ -0,0 +1,32 @@
+from nlp.rewrite import best_hint
+from nlp.score import keyword_ngrams, top_missing_keywords
+
+def test_missing_keywords_skip_terms_in_resume():
+    resume = "Python developer building data pipelines."
+    jd = "Python developer. Kafka streaming. Kafka clusters."
+    missing = top_missing_keywords(resume, jd)
+    assert missing[0] == "kafka"
+    assert "python" not in missing and "developer" not in missing and "python developer" not in missing
+
+def test_missing_keywords_returns_fresh_list():
+    missing = top_missing_keywords("python", "kafka spark")
+    missing.clear()
+    assert top_missing_keywords("python", "kafka spark") == ["kafka", "kafka spark", "spark"]
+
+def test_missing_keywords_ties_break_by_feature_order():
+    # every 1-3 gram occurs once, so all 33 JD terms tie; the top 30 must be the first 30 alphabetically
+    words = "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima".split()
+    grams = words + [" ".join(words[i:i + 2]) for i in range(11)] + [" ".join(words[i:i + 3]) for i in range(10)]
+    assert top_missing_keywords("zulu", " ".join(words), k=30) == sorted(grams)[:30]
+
+def test_keyword_ngrams_counts_terms_and_phrases():
+    text = "We use Python and C++. Python services run on node.js; python services scale."
+    keys = keyword_ngrams(text, top_k=3)
+    assert keys == ["python", "services", "python services"]
+    all_keys = keyword_ngrams(text, top_k=50)
+    assert "c++" in all_keys and "node.js" in all_keys
+    assert "we" not in all_keys and "and" not in all_keys
+
+def test_keyword_ngrams_empty_text():
+    assert keyword_ngrams("  the and of ") == []
+    assert best_hint("") == "the role"
@@ -0,0 +1,20 @@
+from nlp.score import weighted_skill_overlap
+
+SKILLS = ["python", "docker", "aws", "java", "javascript"]
+
+def test_early_lines_weigh_more():
+    jd = "python\n" + "filler\n" * 10 + "docker"
+    assert abs(weighted_skill_overlap(["python"], jd, SKILLS) - 1.5 / 2.5) < 1e-9
+
+def test_header_lines_weigh_more():
+    jd = "filler\n" * 5 + "aws:\n" + "filler\n" * 5 + "docker"
+    assert abs(weighted_skill_overlap(["aws"], jd, SKILLS) - 1.3 / 2.3) < 1e-9
+
+def test_blank_lines_do_not_count_as_early():
+    jd = "\n\n\n\n\n\npython\n" + "filler\n" * 5 + "docker"
+    assert abs(weighted_skill_overlap(["python"], jd, SKILLS) - 1.5 / 2.5) < 1e-9
+
+def test_whole_word_hits_only():
+    jd = "JavaScript developer"
+    assert weighted_skill_overlap(["java"], jd, SKILLS) == 0.0
+    assert weighted_skill_overlap(["javascript"], jd, SKILLS) == 1.0